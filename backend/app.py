@@ -5,31 +5,160 @@ Handles all API routes with proper error handling and database transactions
 
 import sqlite3
 import os
-from flask import Flask, jsonify, request, send_file
-from flask_cors import CORS
-from datetime import datetime, timedelta
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-import io
+import re
+import tempfile
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import orjson
+from flask import Flask, Response, jsonify, request, send_file
+from flask.json.provider import JSONProvider
+from flask_caching import Cache
+from datetime import datetime
+from db import health, pool
+from db.bulk import bulk_insert
+from db.pool import get_conn
+from db.seeding import create_indexes
+from db.stock_logs import log_stock_change, start_writer
+from reports import render_inventory_report, report_fingerprint
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for React frontend
+app.json = OrjsonProvider(app)
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
 
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(__file__), 'inventory.db')
 
+# Maximum number of pooled SQLite connections
+DB_POOL_SIZE = 10
+DB_POOL_TIMEOUT = 2.0   # seconds to wait for a free connection before answering 503
+
+# /api/health answers from a background probe that checks the database this often (seconds)
+HEALTH_PROBE_INTERVAL = 10
+
+# Dashboard stats are cached for this many seconds and dropped on every stock/product write
+DASHBOARD_STATS_CACHE_KEY = 'dashboard-stats'
+DASHBOARD_STATS_CACHE_TIMEOUT = 30
+
+# Per-connection SQLite settings (journal_mode=WAL is persisted in the file by init_db)
+SQLITE_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-50000',     # ~50 MB page cache
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',   # 256 MB memory-mapped I/O
+    'PRAGMA foreign_keys=ON',
+    'PRAGMA busy_timeout=5000',     # wait up to 5s for a write lock
+)
+
+# Page sizes for GET /api/sales
+SALES_PAGE_SIZE = 50
+SALES_PAGE_SIZE_MAX = 200
+
+# PDF reports are rendered by worker processes into this directory
+REPORTS_DIR = os.path.join(tempfile.gettempdir(), 'reports')
+REPORT_WORKERS = 1
+# A pending marker older than this is treated as abandoned (its server process died mid-render)
+REPORT_PENDING_TIMEOUT = 300
+
+_report_executor = None
+_report_jobs = {}  # job_id -> Future for reports still owned by the executor
+_report_jobs_lock = threading.Lock()
+
+# Statement cache size for each connection (sqlite3 default is 128)
+SQLITE_CACHED_STATEMENTS = 256
+
+
+# ==================== SQL STATEMENTS ====================
+# Hot-path statements are kept as constants so each pooled connection
+# prepares them once and reuses them from its statement cache
+
+SQL_GET_STOCK = '''
+    SELECT stock_quantity, price, name
+    FROM products
+    WHERE id = ?
+'''
+
+SQL_UPDATE_STOCK = '''
+    UPDATE products
+    SET stock_quantity = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+SQL_UPDATE_PRODUCT = '''
+    UPDATE products
+    SET name = COALESCE(?, name),
+        sku = COALESCE(?, sku),
+        category_id = COALESCE(?, category_id),
+        price = COALESCE(?, price),
+        purchasing_price = COALESCE(?, purchasing_price),
+        stock_quantity = COALESCE(?, stock_quantity),
+        min_stock_level = COALESCE(?, min_stock_level),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+SQL_DEDUCT_STOCK = '''
+    UPDATE products
+    SET stock_quantity = stock_quantity - ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND stock_quantity >= ?
+    RETURNING stock_quantity, price, name
+'''
+
+SQL_INSERT_SALE = '''
+    INSERT INTO sales (product_id, quantity, total_price, sale_date)
+    VALUES (?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+'''
+
+SQL_DEDUCT_STOCK_BULK = '''
+    UPDATE products
+    SET stock_quantity = stock_quantity - :quantity, updated_at = CURRENT_TIMESTAMP
+    WHERE id = :product_id AND stock_quantity >= :quantity
+'''
+
+SQL_INSERT_SALE_BULK = '''
+    INSERT INTO sales (product_id, quantity, total_price, sale_date)
+    SELECT id, :quantity, price * :quantity, CAST(strftime('%s', 'now') AS INTEGER)
+    FROM products
+    WHERE id = :product_id
+'''
+
 
 # ==================== DATABASE INITIALIZATION ====================
 
-def init_db():
-    """Initialize the database and create tables if they don't exist"""
-    conn = sqlite3.connect(DB_PATH)
+def init_db(conn=None):
+    """
+    Initialize the database and create tables if they don't exist.
+    Uses conn when given (left open for the caller), otherwise opens and closes its own connection.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
     try:
+        # WAL lets readers run alongside the writer and fsyncs far less often
+        journal_mode = cursor.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+        if journal_mode.lower() != 'wal':
+            print(f"⚠️  Could not enable WAL mode (journal_mode={journal_mode})")
+        _configure_conn(conn)
+        
         # Categories table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS categories (
@@ -59,7 +188,6 @@ def init_db():
         # Add purchasing_price column if it doesn't exist (migration)
         try:
             cursor.execute('ALTER TABLE products ADD COLUMN purchasing_price REAL NOT NULL DEFAULT 0')
-            conn.commit()
         except sqlite3.OperationalError:
             # Column already exists, ignore
             pass
@@ -71,7 +199,7 @@ def init_db():
                 product_id INTEGER NOT NULL,
                 quantity INTEGER NOT NULL,
                 total_price REAL NOT NULL,
-                sale_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                sale_date INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),  -- unix seconds
                 FOREIGN KEY (product_id) REFERENCES products(id)
             )
         ''')
@@ -83,16 +211,65 @@ def init_db():
                 product_id INTEGER NOT NULL,
                 change_amount INTEGER NOT NULL,
                 reason TEXT NOT NULL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),  -- unix seconds
                 FOREIGN KEY (product_id) REFERENCES products(id)
             )
         ''')
         
+        # Sale and stock log times are unix seconds; convert text timestamps written by older versions.
+        # Old seed scripts wrote local-time isoformat() strings ('T' separator), the app wrote UTC CURRENT_TIMESTAMP
+        for table, column in (('sales', 'sale_date'), ('stock_logs', 'timestamp')):
+            cursor.execute(f'''
+                UPDATE {table}
+                SET {column} = CAST(CASE WHEN instr({column}, 'T') > 0
+                                         THEN strftime('%s', {column}, 'utc')
+                                         ELSE strftime('%s', {column}) END AS INTEGER)
+                WHERE typeof({column}) = 'text'
+            ''')
+        
         # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_sku ON products(sku)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(sale_date)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_logs_timestamp ON stock_logs(timestamp)')
+        create_indexes(cursor)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_lowstock ON products(stock_quantity, min_stock_level)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_name ON products(name)')
+        
+        # Initial stock is logged by create_product; this trigger from older versions also fired for seed inserts
+        cursor.execute('DROP TRIGGER IF EXISTS trg_products_initial_stock')
+        
+        # Full-text index over product name and SKU, kept in sync by triggers
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'")
+        fts_exists = cursor.fetchone() is not None
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS products_fts
+            USING fts5(name, sku, content='products', content_rowid='id')
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_products_fts_insert
+            AFTER INSERT ON products
+            BEGIN
+                INSERT INTO products_fts (rowid, name, sku) VALUES (NEW.id, NEW.name, NEW.sku);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_products_fts_delete
+            AFTER DELETE ON products
+            BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, sku) VALUES ('delete', OLD.id, OLD.name, OLD.sku);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_products_fts_update
+            AFTER UPDATE OF name, sku ON products
+            BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, sku) VALUES ('delete', OLD.id, OLD.name, OLD.sku);
+                INSERT INTO products_fts (rowid, name, sku) VALUES (NEW.id, NEW.name, NEW.sku);
+            END
+        ''')
+        if not fts_exists:
+            # Index products that existed before the FTS table
+            cursor.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+        
+        # Refresh planner statistics so the new indexes get picked up
+        cursor.execute('ANALYZE')
         
         conn.commit()
         print("✅ Database initialized successfully")
@@ -108,26 +285,45 @@ def init_db():
             ('Toys & Games',),
             ('Health & Beauty',)
         ]
-        cursor.executemany('INSERT OR IGNORE INTO categories (name) VALUES (?)', categories)
-        conn.commit()
+        bulk_insert(conn, 'INSERT OR IGNORE INTO categories (name) VALUES (?)', categories)
         
     except sqlite3.Error as e:
         print(f"❌ Database initialization error: {e}")
         conn.rollback()
         raise
     finally:
-        conn.close()
+        if own_conn:
+            conn.close()
 
 
 # ==================== DATABASE HELPER FUNCTIONS ====================
 
+def _configure_conn(conn):
+    """Apply the per-connection PRAGMAs"""
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+
+
 def get_db_connection():
-    """Get a database connection with row factory for dict-like access"""
-    conn = sqlite3.connect(DB_PATH)
+    """Open a new database connection with row factory for dict-like access"""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=SQLITE_CACHED_STATEMENTS)
     conn.row_factory = sqlite3.Row  # This allows dict-like access to rows
+    _configure_conn(conn)
     return conn
 
 
+# Requests borrow connections from the pool via get_conn() instead of reconnecting
+pool.init_app(app, get_db_connection, max_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT)
+
+# Spawned report workers re-import this module as __mp_main__ when it is run as a script;
+# they need no background threads. Forked server workers restart theirs via os.register_at_fork
+IS_REPORT_WORKER = __name__ == '__mp_main__'
+
+# Stock log entries are written behind the request by a background thread
+if not IS_REPORT_WORKER:
+    start_writer(get_db_connection)
+
+
 # ==================== UTILITY FUNCTIONS ====================
 
 def format_error(message, status_code=400):
@@ -135,68 +331,93 @@ def format_error(message, status_code=400):
     return jsonify({'error': message}), status_code
 
 
+def format_integrity_error(e):
+    """Map a products constraint violation to the matching error response"""
+    message = e.args[0]
+    if 'UNIQUE' in message:
+        return format_error("SKU already exists", 400)
+    if 'FOREIGN KEY' in message:
+        return format_error("Category not found", 404)
+    return format_error(f"Invalid product data: {message}", 400)
+
+
+def fetch_dicts(cursor):
+    """Fetch all rows as dicts, resolving the column names once per result set"""
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def add_dev_cors_headers(response):
+    """Allow the React dev server to call the API (in production NGINX adds these headers)"""
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, OPTIONS'
+    response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    return response
+
+
+def enable_dev_cors():
+    """Register add_dev_cors_headers once"""
+    if add_dev_cors_headers not in app.after_request_funcs.get(None, []):
+        app.after_request(add_dev_cors_headers)
+
+
+if os.environ.get('FLASK_ENV') == 'development':
+    enable_dev_cors()
+
+
+def invalidate_dashboard_stats():
+    """Drop the cached dashboard stats after a write"""
+    cache.delete(DASHBOARD_STATS_CACHE_KEY)
+
+
 # ==================== DASHBOARD STATS ====================
 
 @app.route('/api/dashboard-stats', methods=['GET'])
+@cache.cached(
+    timeout=DASHBOARD_STATS_CACHE_TIMEOUT,
+    key_prefix=DASHBOARD_STATS_CACHE_KEY,
+    response_filter=lambda response: not isinstance(response, tuple)  # don't cache errors
+)
 def dashboard_stats():
     """Get dashboard statistics including total value, low stock count, total orders, and 7-day sales trend"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Total inventory value (at selling price)
-        cursor.execute('''
-            SELECT COALESCE(SUM(price * stock_quantity), 0) as total_value
-            FROM products
-        ''')
-        total_value = cursor.fetchone()['total_value'] or 0.0
-        
-        # Total profit (selling price - purchasing price) * stock quantity
-        cursor.execute('''
-            SELECT COALESCE(SUM((price - COALESCE(purchasing_price, 0)) * stock_quantity), 0) as total_profit
-            FROM products
-        ''')
-        total_profit = cursor.fetchone()['total_profit'] or 0.0
-        
-        # Low stock count (stock_quantity <= min_stock_level)
-        cursor.execute('''
-            SELECT COUNT(*) as low_stock_count
-            FROM products
-            WHERE stock_quantity <= min_stock_level
-        ''')
-        low_stock_count = cursor.fetchone()['low_stock_count']
+        with get_conn() as conn:
+            cursor = conn.cursor()
         
-        # Total orders (sales count)
-        cursor.execute('SELECT COUNT(*) as total_orders FROM sales')
-        total_orders = cursor.fetchone()['total_orders']
+            # Inventory value (at selling price), profit and low stock count in one products scan
+            cursor.execute('''
+                SELECT
+                    COALESCE(SUM(price * stock_quantity), 0) as total_value,
+                    COALESCE(SUM((price - COALESCE(purchasing_price, 0)) * stock_quantity), 0) as total_profit,
+                    COALESCE(SUM(CASE WHEN stock_quantity <= min_stock_level THEN 1 ELSE 0 END), 0) as low_stock_count
+                FROM products
+            ''')
+            total_value, total_profit, low_stock_count = cursor.fetchone()
         
-        # 7-day sales trend
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        cursor.execute('''
-            SELECT 
-                DATE(sale_date) as sale_date,
-                COALESCE(SUM(total_price), 0) as daily_total
-            FROM sales
-            WHERE sale_date >= ?
-            GROUP BY DATE(sale_date)
-            ORDER BY sale_date ASC
-        ''', (seven_days_ago.isoformat(),))
-        
-        sales_data = {row['sale_date']: row['daily_total'] for row in cursor.fetchall()}
-        
-        # Create a complete 7-day array (fill missing days with 0)
-        sales_trend = []
-        for i in range(7):
-            date = (datetime.now() - timedelta(days=6-i)).date()
-            date_str = date.isoformat()
-            daily_sale = sales_data.get(date_str, 0.0)
-            sales_trend.append({
-                'date': date_str,
-                'value': float(daily_sale)
-            })
-        
-        conn.close()
+            # Total orders (sales count)
+            cursor.execute('SELECT COUNT(*) as total_orders FROM sales')
+            total_orders = cursor.fetchone()[0]
         
+            # 7-day sales trend (days without sales are zero-filled by the CTE)
+            cursor.execute('''
+                WITH RECURSIVE days(d) AS (
+                    SELECT date('now', 'localtime', '-6 days')
+                    UNION ALL
+                    SELECT date(d, '+1 day') FROM days WHERE d < date('now', 'localtime')
+                )
+                SELECT 
+                    d as date,
+                    COALESCE((
+                        SELECT SUM(total_price)
+                        FROM sales
+                        WHERE sale_date >= CAST(strftime('%s', d, 'utc') AS INTEGER)
+                          AND sale_date < CAST(strftime('%s', d, '+1 day', 'utc') AS INTEGER)
+                    ), 0) as value
+                FROM days
+            ''')
+            
+            sales_trend = [{'date': date, 'value': float(value)} for date, value in cursor]
+
         return jsonify({
             'total_value': round(total_value, 2),
             'total_profit': round(total_profit, 2),
@@ -219,9 +440,6 @@ def get_products():
         search = request.args.get('search', '').strip()
         low_stock_only = request.args.get('low_stock_only', 'false').lower() == 'true'
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         query = '''
             SELECT 
                 p.id,
@@ -242,19 +460,26 @@ def get_products():
         params = []
         
         if search:
-            query += " AND (p.name LIKE ? OR p.sku LIKE ?)"
-            search_pattern = f"%{search}%"
-            params.extend([search_pattern, search_pattern])
+            search_terms = re.findall(r'\w+', search)
+            if search_terms:
+                # Prefix match every word of the search against the full-text index
+                query += " AND p.id IN (SELECT rowid FROM products_fts WHERE products_fts MATCH ?)"
+                params.append(' '.join(f'"{term}"*' for term in search_terms))
+            else:
+                query += " AND (p.name LIKE ? OR p.sku LIKE ?)"
+                search_pattern = f"%{search}%"
+                params.extend([search_pattern, search_pattern])
         
         if low_stock_only:
             query += " AND p.stock_quantity <= p.min_stock_level"
         
         query += " ORDER BY p.name ASC"
         
-        cursor.execute(query, params)
-        products = [dict(row) for row in cursor.fetchall()]
-        
-        conn.close()
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # plain tuples; fetch_dicts attaches the column names
+            cursor.execute(query, params)
+            products = fetch_dicts(cursor)
         
         return jsonify(products)
         
@@ -267,26 +492,25 @@ def get_products():
 def get_product(product_id):
     """Get a single product by ID"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT 
-                p.id,
-                p.name,
-                p.sku,
-                p.category_id,
-                c.name as category_name,
-                p.price,
-                p.purchasing_price,
-                p.stock_quantity,
-                p.min_stock_level
-            FROM products p
-            JOIN categories c ON p.category_id = c.id
-            WHERE p.id = ?
-        ''', (product_id,))
-        
-        product = cursor.fetchone()
-        conn.close()
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT 
+                    p.id,
+                    p.name,
+                    p.sku,
+                    p.category_id,
+                    c.name as category_name,
+                    p.price,
+                    p.purchasing_price,
+                    p.stock_quantity,
+                    p.min_stock_level
+                FROM products p
+                JOIN categories c ON p.category_id = c.id
+                WHERE p.id = ?
+            ''', (product_id,))
+            
+            product = cursor.fetchone()
         
         if not product:
             return format_error("Product not found", 404)
@@ -330,50 +554,34 @@ def create_product():
         if stock_quantity < 0:
             return format_error("Stock quantity cannot be negative", 400)
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        with get_conn() as conn:
+            cursor = conn.cursor()
         
-        try:
-            # Check if SKU already exists
-            cursor.execute('SELECT id FROM products WHERE sku = ?', (sku,))
-            if cursor.fetchone():
-                conn.close()
-                return format_error("SKU already exists", 400)
-            
-            # Check if category exists
-            cursor.execute('SELECT id FROM categories WHERE id = ?', (category_id,))
-            if not cursor.fetchone():
-                conn.close()
-                return format_error("Category not found", 404)
-            
-            # Insert product
-            cursor.execute('''
-                INSERT INTO products (name, sku, category_id, price, purchasing_price, stock_quantity, min_stock_level)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (name, sku, category_id, price, purchasing_price, stock_quantity, min_stock_level))
+            try:
+                # Insert product; UNIQUE(sku) and the category foreign key do the validation
+                cursor.execute('''
+                    INSERT INTO products (name, sku, category_id, price, purchasing_price, stock_quantity, min_stock_level)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (name, sku, category_id, price, purchasing_price, stock_quantity, min_stock_level))
             
-            product_id = cursor.lastrowid
+                product_id = cursor.lastrowid
             
-            # Log stock change if initial stock > 0
-            if stock_quantity > 0:
-                cursor.execute('''
-                    INSERT INTO stock_logs (product_id, change_amount, reason, timestamp)
-                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (product_id, stock_quantity, 'Initial stock'))
+                conn.commit()
+                invalidate_dashboard_stats()
             
-            conn.commit()
-            conn.close()
+                # Log initial stock once the product is committed
+                if stock_quantity > 0:
+                    log_stock_change(product_id, stock_quantity, "Initial stock")
             
-            return jsonify({
-                'success': True,
-                'message': f'Product "{name}" created successfully',
-                'product_id': product_id
-            }), 201
+                return jsonify({
+                    'success': True,
+                    'message': f'Product "{name}" created successfully',
+                    'product_id': product_id
+                }), 201
             
-        except sqlite3.IntegrityError as e:
-            conn.rollback()
-            conn.close()
-            return format_error("SKU already exists", 400)
+            except sqlite3.IntegrityError as e:
+                conn.rollback()
+                return format_integrity_error(e)
             
     except ValueError as e:
         return format_error(f"Invalid value: {str(e)}", 400)
@@ -388,110 +596,67 @@ def update_product(product_id):
     try:
         data = request.get_json()
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if product exists
-        cursor.execute('SELECT id FROM products WHERE id = ?', (product_id,))
-        if not cursor.fetchone():
-            conn.close()
-            return format_error("Product not found", 404)
-        
-        # Build update query dynamically based on provided fields
-        updates = []
-        params = []
+        # Validate provided fields; fields left as None keep their current value
+        name = sku = category_id = price = purchasing_price = stock_quantity = min_stock_level = None
         
         if 'name' in data:
             name = data['name'].strip()
             if not name:
-                conn.close()
                 return format_error("Name cannot be empty", 400)
-            updates.append('name = ?')
-            params.append(name)
         
         if 'sku' in data:
             sku = data['sku'].strip()
             if not sku:
-                conn.close()
                 return format_error("SKU cannot be empty", 400)
-            # Check if SKU is already used by another product
-            cursor.execute('SELECT id FROM products WHERE sku = ? AND id != ?', (sku, product_id))
-            if cursor.fetchone():
-                conn.close()
-                return format_error("SKU already exists", 400)
-            updates.append('sku = ?')
-            params.append(sku)
         
         if 'category_id' in data:
             category_id = data['category_id']
-            # Check if category exists
-            cursor.execute('SELECT id FROM categories WHERE id = ?', (category_id,))
-            if not cursor.fetchone():
-                conn.close()
-                return format_error("Category not found", 404)
-            updates.append('category_id = ?')
-            params.append(category_id)
         
         if 'price' in data:
             price = float(data['price'])
             if price <= 0:
-                conn.close()
                 return format_error("Price must be greater than 0", 400)
-            updates.append('price = ?')
-            params.append(price)
         
         if 'purchasing_price' in data:
             purchasing_price = float(data['purchasing_price'])
             if purchasing_price < 0:
-                conn.close()
                 return format_error("Purchasing price cannot be negative", 400)
-            updates.append('purchasing_price = ?')
-            params.append(purchasing_price)
         
         if 'stock_quantity' in data:
             stock_quantity = int(data['stock_quantity'])
             if stock_quantity < 0:
-                conn.close()
                 return format_error("Stock quantity cannot be negative", 400)
-            # Get current stock to calculate change
-            cursor.execute('SELECT stock_quantity FROM products WHERE id = ?', (product_id,))
-            current_stock = cursor.fetchone()['stock_quantity']
-            stock_change = stock_quantity - current_stock
-            updates.append('stock_quantity = ?')
-            params.append(stock_quantity)
         
         if 'min_stock_level' in data:
             min_stock_level = int(data['min_stock_level'])
             if min_stock_level < 0:
-                conn.close()
                 return format_error("Min stock level cannot be negative", 400)
-            updates.append('min_stock_level = ?')
-            params.append(min_stock_level)
         
-        if not updates:
-            conn.close()
+        params = (name, sku, category_id, price, purchasing_price, stock_quantity, min_stock_level)
+        if all(value is None for value in params):
             return format_error("No fields to update", 400)
         
-        # Add updated_at timestamp
-        updates.append('updated_at = CURRENT_TIMESTAMP')
-        
-        # Add product_id to params
-        params.append(product_id)
-        
-        # Execute update
-        query = f'UPDATE products SET {", ".join(updates)} WHERE id = ?'
-        cursor.execute(query, params)
+        with get_conn() as conn:
+            # Current stock doubles as the existence check and the base for the stock log
+            product = conn.execute(SQL_GET_STOCK, (product_id,)).fetchone()
+            if not product:
+                return format_error("Product not found", 404)
+            
+            try:
+                # UNIQUE(sku) and the category foreign key do the remaining validation
+                conn.execute(SQL_UPDATE_PRODUCT, params + (product_id,))
+            except sqlite3.IntegrityError as e:
+                conn.rollback()
+                return format_integrity_error(e)
+            
+            conn.commit()
+            invalidate_dashboard_stats()
         
         # Log stock change if stock_quantity was updated
-        if 'stock_quantity' in data and stock_change != 0:
+        stock_change = 0 if stock_quantity is None else stock_quantity - product[0]
+        if stock_change != 0:
             reason = 'Stock adjustment' if stock_change > 0 else 'Stock reduction'
-            cursor.execute('''
-                INSERT INTO stock_logs (product_id, change_amount, reason, timestamp)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (product_id, stock_change, reason))
-        
-        conn.commit()
-        conn.close()
+            log_stock_change(product_id, stock_change, reason)
         
         return jsonify({
             'success': True,
@@ -524,107 +689,163 @@ def add_sale():
         if quantity <= 0:
             return format_error("Quantity must be greater than 0", 400)
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Start transaction (SQLite uses implicit transactions)
-        try:
-            # Get current product stock (with lock)
-            cursor.execute('''
-                SELECT stock_quantity, price, name
-                FROM products
-                WHERE id = ?
-            ''', (product_id,))
-            
-            product = cursor.fetchone()
-            if not product:
-                conn.rollback()
-                conn.close()
-                return format_error("Product not found", 404)
+        with get_conn() as conn:
+            # Start transaction (SQLite uses implicit transactions)
+            try:
+                # Deduct stock only if enough is available (check and update in one statement)
+                product = conn.execute(SQL_DEDUCT_STOCK, (quantity, product_id, quantity)).fetchone()
+                if not product:
+                    # Nothing updated: find out whether the product is missing or short on stock
+                    current = conn.execute(SQL_GET_STOCK, (product_id,)).fetchone()
+                    conn.rollback()
+                    if not current:
+                        return format_error("Product not found", 404)
+                    return format_error(
+                        f"Insufficient stock. Available: {current[0]}, Requested: {quantity}",
+                        400
+                    )
             
-            current_stock = product['stock_quantity']
-            price = product['price']
-            product_name = product['name']
+                new_stock, price, product_name = product
             
-            # Check if sufficient stock
-            if current_stock < quantity:
-                conn.rollback()
-                conn.close()
-                return format_error(
-                    f"Insufficient stock. Available: {current_stock}, Requested: {quantity}",
-                    400
-                )
-            
-            # Calculate total price
-            total_price = price * quantity
-            
-            # Deduct stock
-            new_stock = current_stock - quantity
-            cursor.execute('''
-                UPDATE products
-                SET stock_quantity = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (new_stock, product_id))
-            
-            # Record sale
-            cursor.execute('''
-                INSERT INTO sales (product_id, quantity, total_price, sale_date)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (product_id, quantity, total_price))
+                # Calculate total price
+                total_price = price * quantity
             
-            sale_id = cursor.lastrowid
+                # Record sale
+                sale_id = conn.execute(SQL_INSERT_SALE, (product_id, quantity, total_price)).lastrowid
             
-            # Log stock change
-            cursor.execute('''
-                INSERT INTO stock_logs (product_id, change_amount, reason, timestamp)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (product_id, -quantity, f"Sale #{sale_id}"))
+                # Commit transaction
+                conn.commit()
+                invalidate_dashboard_stats()
             
-            # Commit transaction
-            conn.commit()
-            conn.close()
+                # Log stock change once the sale is committed
+                log_stock_change(product_id, -quantity, f"Sale #{sale_id}")
             
-            return jsonify({
-                'success': True,
-                'sale_id': sale_id,
-                'message': f"Sale recorded: {quantity} x {product_name}",
-                'total_price': round(total_price, 2),
-                'remaining_stock': new_stock
-            }), 201
+                return jsonify({
+                    'success': True,
+                    'sale_id': sale_id,
+                    'message': f"Sale recorded: {quantity} x {product_name}",
+                    'total_price': round(total_price, 2),
+                    'remaining_stock': new_stock
+                }), 201
             
-        except Exception as e:
-            conn.rollback()
-            conn.close()
-            raise e
+            except Exception as e:
+                conn.rollback()
+                raise e
                 
     except Exception as e:
         print(f"Error recording sale: {e}")
         return format_error(f"Failed to record sale: {str(e)}", 500)
 
 
+@app.route('/api/add-sales', methods=['POST'])
+def add_sales():
+    """
+    Record a basket of sales with one atomic transaction.
+    Either every item is sold or nothing is, with per-item errors on failure.
+    """
+    try:
+        data = request.get_json()
+        items = data.get('items')
+        
+        if not items or not isinstance(items, list):
+            return format_error("items must be a non-empty list", 400)
+        
+        for item in items:
+            if not isinstance(item, dict) or not item.get('product_id') or not item.get('quantity'):
+                return format_error("Each item needs product_id and quantity", 400)
+            if item['quantity'] <= 0:
+                return format_error("Quantity must be greater than 0", 400)
+        
+        params = [{'product_id': item['product_id'], 'quantity': item['quantity']} for item in items]
+        
+        with get_conn() as conn:
+            try:
+                # Deduct stock for the whole basket; every row must match or the basket is rejected
+                cursor = conn.executemany(SQL_DEDUCT_STOCK_BULK, params)
+                if cursor.rowcount != len(params):
+                    conn.rollback()
+                    
+                    # Report which items could not be sold against the untouched stock levels
+                    product_ids = sorted({p['product_id'] for p in params})
+                    placeholders = ','.join('?' * len(product_ids))
+                    stock = dict(conn.execute(
+                        f'SELECT id, stock_quantity FROM products WHERE id IN ({placeholders})',
+                        product_ids
+                    ).fetchall())
+                    requested = {}
+                    for p in params:
+                        requested[p['product_id']] = requested.get(p['product_id'], 0) + p['quantity']
+                    
+                    errors = []
+                    for product_id in product_ids:
+                        if product_id not in stock:
+                            errors.append({'product_id': product_id, 'error': "Product not found"})
+                        elif stock[product_id] < requested[product_id]:
+                            errors.append({
+                                'product_id': product_id,
+                                'error': f"Insufficient stock. Available: {stock[product_id]}, Requested: {requested[product_id]}"
+                            })
+                    return jsonify({'error': "Sale could not be recorded", 'items': errors}), 400
+                
+                conn.executemany(SQL_INSERT_SALE_BULK, params)
+                
+                # Sale ids are allocated in order while this transaction holds the write lock
+                rows = conn.execute('SELECT id FROM sales ORDER BY id DESC LIMIT ?', (len(params),)).fetchall()
+                sale_ids = [row[0] for row in reversed(rows)]
+                
+                conn.commit()
+                invalidate_dashboard_stats()
+                
+                # Log stock changes once the sales are committed
+                for sale_id, p in zip(sale_ids, params):
+                    log_stock_change(p['product_id'], -p['quantity'], f"Sale #{sale_id}")
+                
+                return jsonify({
+                    'success': True,
+                    'sale_ids': sale_ids,
+                    'message': f"{len(sale_ids)} sales recorded"
+                }), 201
+            
+            except Exception as e:
+                conn.rollback()
+                raise e
+                
+    except Exception as e:
+        print(f"Error recording sales: {e}")
+        return format_error(f"Failed to record sales: {str(e)}", 500)
+
+
 @app.route('/api/sales', methods=['GET'])
 def get_sales():
-    """Get all sales with optional date range"""
+    """
+    Get sales, newest first.
+    Paginate with ?limit= (default 50, max 200) and ?before_id=<id of the last sale already seen>.
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT 
-                s.id,
-                s.product_id,
-                p.name as product_name,
-                p.sku,
-                s.quantity,
-                s.total_price,
-                s.sale_date
-            FROM sales s
-            JOIN products p ON s.product_id = p.id
-            ORDER BY s.sale_date DESC
-            LIMIT 100
-        ''')
+        before_id = request.args.get('before_id', type=int)
+        limit = request.args.get('limit', SALES_PAGE_SIZE, type=int)
+        limit = max(1, min(limit, SALES_PAGE_SIZE_MAX))
         
-        sales = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # plain tuples; fetch_dicts attaches the column names
+            cursor.execute('''
+                SELECT 
+                    s.id,
+                    s.product_id,
+                    p.name as product_name,
+                    p.sku,
+                    s.quantity,
+                    s.total_price,
+                    datetime(s.sale_date, 'unixepoch') as sale_date
+                FROM sales s
+                JOIN products p ON s.product_id = p.id
+                WHERE (? IS NULL OR s.id < ?)
+                ORDER BY s.id DESC
+                LIMIT ?
+            ''', (before_id, before_id, limit))
+        
+            sales = fetch_dicts(cursor)
         
         return jsonify(sales)
         
@@ -650,55 +871,37 @@ def restock():
         if quantity <= 0:
             return format_error("Quantity must be greater than 0", 400)
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Start transaction
-        try:
-            # Get current product
-            cursor.execute('''
-                SELECT stock_quantity, name
-                FROM products
-                WHERE id = ?
-            ''', (product_id,))
+        with get_conn() as conn:
+            # Start transaction
+            try:
+                # Get current product
+                product = conn.execute(SQL_GET_STOCK, (product_id,)).fetchone()
+                if not product:
+                    conn.rollback()
+                    return format_error("Product not found", 404)
             
-            product = cursor.fetchone()
-            if not product:
-                conn.rollback()
-                conn.close()
-                return format_error("Product not found", 404)
+                current_stock, _, product_name = product
             
-            current_stock = product['stock_quantity']
-            product_name = product['name']
+                # Update stock
+                new_stock = current_stock + quantity
+                conn.execute(SQL_UPDATE_STOCK, (new_stock, product_id))
             
-            # Update stock
-            new_stock = current_stock + quantity
-            cursor.execute('''
-                UPDATE products
-                SET stock_quantity = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (new_stock, product_id))
-            
-            # Log stock change
-            cursor.execute('''
-                INSERT INTO stock_logs (product_id, change_amount, reason, timestamp)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (product_id, quantity, reason))
+                # Commit transaction
+                conn.commit()
+                invalidate_dashboard_stats()
             
-            # Commit transaction
-            conn.commit()
-            conn.close()
+                # Log stock change once the restock is committed
+                log_stock_change(product_id, quantity, reason)
             
-            return jsonify({
-                'success': True,
-                'message': f"Restocked {quantity} units of {product_name}",
-                'new_stock': new_stock
-            }), 200
+                return jsonify({
+                    'success': True,
+                    'message': f"Restocked {quantity} units of {product_name}",
+                    'new_stock': new_stock
+                }), 200
             
-        except Exception as e:
-            conn.rollback()
-            conn.close()
-            raise e
+            except Exception as e:
+                conn.rollback()
+                raise e
                 
     except Exception as e:
         print(f"Error restocking: {e}")
@@ -711,11 +914,10 @@ def restock():
 def get_categories():
     """Get all categories"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, name FROM categories ORDER BY name ASC')
-        categories = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, name FROM categories ORDER BY name ASC')
+            categories = [dict(row) for row in cursor.fetchall()]
         return jsonify(categories)
         
     except Exception as e:
@@ -725,127 +927,148 @@ def get_categories():
 
 # ==================== PDF EXPORT ====================
 
+def _get_report_executor():
+    """Lazily start the worker process pool that renders PDF reports"""
+    global _report_executor
+    with _report_jobs_lock:
+        if _report_executor is None:
+            # spawn, not fork: this process runs background threads and holds open SQLite connections
+            _report_executor = ProcessPoolExecutor(
+                max_workers=REPORT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _report_executor
+
+
+def _reset_report_executor(executor):
+    """Drop a broken worker pool so the next export starts a fresh one"""
+    global _report_executor
+    with _report_jobs_lock:
+        if _report_executor is executor:
+            _report_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _report_path(job_id):
+    """Location of the rendered PDF for a job"""
+    return os.path.join(REPORTS_DIR, f'{job_id}.pdf')
+
+
+def _marker_path(job_id):
+    """Marker file that tells every server process a job is being rendered"""
+    return os.path.join(REPORTS_DIR, f'{job_id}.pending')
+
+
+def _marker_age(job_id):
+    """Seconds since the job's marker was written, or None if there is none"""
+    try:
+        return time.time() - os.path.getmtime(_marker_path(job_id))
+    except FileNotFoundError:
+        return None
+
+
+def _report_pending(job_id):
+    """True while some server process is rendering the job"""
+    age = _marker_age(job_id)
+    return age is not None and age < REPORT_PENDING_TIMEOUT
+
+
+def _claim_report(job_id):
+    """Write the job's marker; False if another thread or server process is already rendering it"""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    try:
+        os.close(os.open(_marker_path(job_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        if _marker_age(job_id) is None or _report_pending(job_id):
+            return False
+        os.utime(_marker_path(job_id))  # take over an abandoned job
+        return True
+
+
+def _release_report(job_id):
+    """Remove the job's marker once its render has finished or failed"""
+    try:
+        os.remove(_marker_path(job_id))
+    except FileNotFoundError:
+        pass
+
+
+def _submit_report(job_id, path):
+    """Hand a claimed job to the worker pool, replacing the pool once if a worker has died"""
+    for attempt in range(2):
+        executor = _get_report_executor()
+        try:
+            future = executor.submit(render_inventory_report, DB_PATH, path)
+            break
+        except BrokenProcessPool:
+            _reset_report_executor(executor)
+            if attempt:
+                raise
+    
+    with _report_jobs_lock:
+        _report_jobs[job_id] = future
+    future.add_done_callback(lambda _: _release_report(job_id))
+
+
 @app.route('/api/export-pdf', methods=['GET'])
 def export_pdf():
-    """Generate a professional PDF inventory report"""
+    """
+    Queue a PDF inventory report and return its job id (202).
+    The job id is a hash of the rows the report shows, so repeated requests
+    against an unchanged inventory reuse the already rendered file.
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        with get_conn() as conn:
+            job_id = report_fingerprint(conn)[:16]
+        path = _report_path(job_id)
+        
+        with _report_jobs_lock:
+            queued = job_id in _report_jobs
+        if not queued and not os.path.exists(path) and _claim_report(job_id):
+            try:
+                _submit_report(job_id, path)
+            except Exception:
+                _release_report(job_id)
+                raise
+        
+        status = 'ready' if os.path.exists(path) else 'pending'
+        return jsonify({'job_id': job_id, 'status': status}), 202
         
-        # Fetch all products with categories
-        cursor.execute('''
-            SELECT 
-                p.sku,
-                p.name,
-                c.name as category_name,
-                p.price,
-                p.stock_quantity,
-                p.min_stock_level,
-                CASE 
-                    WHEN p.stock_quantity = 0 THEN 'Out of Stock'
-                    WHEN p.stock_quantity <= p.min_stock_level THEN 'Low Stock'
-                    ELSE 'In Stock'
-                END as status
-            FROM products p
-            JOIN categories c ON p.category_id = c.id
-            ORDER BY p.name ASC
-        ''')
-        
-        products = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        # Create PDF in memory
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        elements = []
-        
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1e293b'),
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        
-        # Title
-        title = Paragraph("Enterprise Smart-IMS Inventory Report", title_style)
-        elements.append(title)
-        
-        # Report date
-        date_style = ParagraphStyle(
-            'DateStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#64748b'),
-            alignment=1
-        )
-        date_text = Paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", date_style)
-        elements.append(date_text)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Prepare table data
-        table_data = [['SKU', 'Product Name', 'Category', 'Price', 'Stock', 'Min Level', 'Status']]
-        
-        for product in products:
-            status = product['status']
-            row = [
-                product['sku'],
-                product['name'],
-                product['category_name'],
-                f"${float(product['price']):.2f}",
-                str(product['stock_quantity']),
-                str(product['min_stock_level']),
-                status
-            ]
-            table_data.append(row)
-        
-        # Create table
-        table = Table(table_data, colWidths=[1*inch, 2*inch, 1.2*inch, 0.8*inch, 0.7*inch, 0.8*inch, 1*inch])
-        
-        # Style the table
-        table_style = TableStyle([
-            # Header row
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            
-            # Data rows
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-        ])
-        
-        # Color code status column
-        for i, product in enumerate(products, start=1):
-            status = product['status']
-            if status == 'Out of Stock':
-                table_style.add('TEXTCOLOR', (6, i), (6, i), colors.HexColor('#dc2626'))
-            elif status == 'Low Stock':
-                table_style.add('TEXTCOLOR', (6, i), (6, i), colors.HexColor('#ca8a04'))
-            else:
-                table_style.add('TEXTCOLOR', (6, i), (6, i), colors.HexColor('#16a34a'))
-        
-        table.setStyle(table_style)
-        elements.append(table)
-        
-        # Build PDF
-        doc.build(elements)
-        buffer.seek(0)
+    except Exception as e:
+        print(f"Error generating PDF: {e}")
+        return format_error(f"Failed to generate PDF: {str(e)}", 500)
+
+
+@app.route('/api/export-pdf/<job_id>', methods=['GET'])
+def download_pdf(job_id):
+    """
+    Download a queued PDF report, or 202 while it is still rendering.
+    The job may be rendering in another server process, so its marker file counts as pending too.
+    """
+    try:
+        if not re.fullmatch(r'[0-9a-f]{16}', job_id):
+            return format_error("Report not found", 404)
+        
+        with _report_jobs_lock:
+            future = _report_jobs.get(job_id)
+            if future is not None and future.done():
+                del _report_jobs[job_id]
+        
+        if future is not None:
+            if not future.done():
+                return jsonify({'job_id': job_id, 'status': 'pending'}), 202
+            if future.exception() is not None:
+                raise future.exception()
+        
+        path = _report_path(job_id)
+        if not os.path.exists(path):
+            if _report_pending(job_id):
+                return jsonify({'job_id': job_id, 'status': 'pending'}), 202
+            return format_error("Report not found", 404)
         
-        # Return PDF
         return send_file(
-            buffer,
+            path,
             mimetype='application/pdf',
             as_attachment=True,
             download_name=f'inventory_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
@@ -858,21 +1081,44 @@ def export_pdf():
 
 # ==================== HEALTH CHECK ====================
 
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
+def check_health():
+    """Probe the database, returning (body, status_code)"""
     try:
         if os.path.exists(DB_PATH):
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT 1')
-            cursor.fetchone()
-            conn.close()
-            return jsonify({'status': 'healthy', 'database': 'connected'})
+            with get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            return {'status': 'healthy', 'database': 'connected'}, 200
         else:
-            return jsonify({'status': 'unhealthy', 'database': 'not_found'}), 503
+            return {'status': 'unhealthy', 'database': 'not_found'}, 503
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        return {'status': 'error', 'message': str(e)}, 500
+
+
+if not IS_REPORT_WORKER:
+    health.start_probe(check_health, interval=HEALTH_PROBE_INTERVAL)
+
+# Pre-serialized body for the common case of a fresh, healthy probe
+HEALTHY_BODY = b'{"status":"healthy","database":"connected"}'
+
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """
+    Health check endpoint.
+    Answers from the background probe; ?deep=1, or a probe result that has gone
+    stale (probe thread not running), checks the database live.
+    """
+    deep = request.args.get('deep') == '1'
+    if not deep and health.is_healthy():
+        return Response(HEALTHY_BODY, mimetype='application/json')
+    
+    result = None if deep else health.cached_status()
+    if result is None:
+        result = health.refresh()
+    body, status_code = result
+    return jsonify(body), status_code
 
 
 # ==================== INITIALIZE DATABASE ON STARTUP ====================
@@ -880,8 +1126,11 @@ def health_check():
 if __name__ == '__main__':
     print("🚀 Starting Enterprise Smart-IMS Backend...")
     print("📦 Initializing database...")
-    init_db()
+    # Initialize on a pooled connection so the first request reuses it instead of reopening the file
+    with get_conn() as conn:
+        init_db(conn)
     print("✅ Database ready!")
+    enable_dev_cors()
     print("🌐 API available at http://localhost:5000")
     app.run(debug=True, port=5000)
 
@@ -0,0 +1,3 @@
+"""
+Database helpers for Enterprise Smart-IMS
+"""
@@ -0,0 +1,33 @@
+"""
+Bulk insert helper for Enterprise Smart-IMS
+Batches rows through executemany so each chunk costs one transaction
+"""
+
+from itertools import islice
+
+
+def bulk_insert(conn, sql, rows, chunk=500):
+    """
+    Insert rows with executemany, one explicit transaction per chunk.
+    Any transaction already open on conn is committed together with the first chunk.
+    Returns the number of rows inserted.
+    """
+    rows = iter(rows)
+    total = 0
+    
+    while True:
+        batch = list(islice(rows, chunk))
+        if not batch:
+            break
+        
+        if not conn.in_transaction:
+            conn.execute('BEGIN')
+        try:
+            conn.executemany(sql, batch)
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+        total += len(batch)
+    
+    return total
@@ -0,0 +1,73 @@
+"""
+Background database health probe for Enterprise Smart-IMS
+Runs the health check on a timer so /api/health can answer from memory
+instead of touching the database on every monitor poll
+"""
+
+import os
+import threading
+import time
+
+_check = None
+_prober = None
+_interval = None
+_last_result = None     # (body, status_code) of the most recent check
+_last_check_ts = None   # time.monotonic() of the most recent check
+
+
+def refresh():
+    """Run the health check now and cache its result"""
+    global _last_result, _last_check_ts
+    body, status_code = _check()
+    _last_check_ts = time.monotonic()
+    _last_result = (body, status_code)
+    return _last_result
+
+
+def _is_stale():
+    """True when no check has completed within the last two intervals (e.g. the probe thread is gone)"""
+    return _last_check_ts is None or time.monotonic() - _last_check_ts > 2 * _interval
+
+
+def is_healthy():
+    """True when the most recent check passed and is not stale"""
+    return _last_result is not None and _last_result[1] == 200 and not _is_stale()
+
+
+def cached_status():
+    """Return the cached (body, status_code), or None if there is no recent check to serve"""
+    if _last_result is None or _is_stale():
+        return None
+    return _last_result
+
+
+def _run(interval):
+    """Probe loop for the background thread"""
+    while True:
+        try:
+            refresh()
+        except Exception as e:
+            print(f"Error probing database health: {e}")
+        time.sleep(interval)
+
+
+def start_probe(check, interval=10):
+    """Start the background probe thread (once per process); check returns (body, status_code)"""
+    global _check, _prober, _interval
+    _check = check
+    _interval = interval
+    if _prober is None:
+        _prober = threading.Thread(target=_run, args=(interval,), name='health-probe', daemon=True)
+        _prober.start()
+
+
+def _restart_after_fork():
+    """Threads do not survive fork, so a forked child (e.g. a gunicorn --preload worker) starts its own probe"""
+    global _prober
+    if _prober is not None:
+        _prober = threading.Thread(target=_run, args=(_interval,), name='health-probe', daemon=True)
+        _prober.start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
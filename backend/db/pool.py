@@ -0,0 +1,148 @@
+"""
+SQLite connection pool for Enterprise Smart-IMS
+Keeps a bounded LIFO stack of open connections so requests reuse them
+instead of reconnecting to the database file on every call
+"""
+
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from flask import g, has_app_context, json
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection frees up within the pool timeout"""
+
+
+class ConnectionPool:
+    """Bounded LIFO pool of sqlite3 connections built by a connect factory"""
+
+    def __init__(self, connect, max_size=10, timeout=None):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take an idle connection, open a new one if under max_size, otherwise wait up to timeout"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.max_size
+            if can_create:
+                self._created += 1
+
+        if not can_create:
+            try:
+                return self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise PoolTimeout(f"No database connection available after {self.timeout}s") from None
+
+        try:
+            return self.connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any uncommitted work"""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put_nowait(conn)
+
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pool = None
+_inherited_pools = []  # pools copied from the parent process by fork; kept alive, never used
+
+
+def init_pool(connect, max_size=10, timeout=None):
+    """(Re)create the process-wide pool"""
+    global _pool
+    if _pool is not None:
+        _pool.close_all()
+    _pool = ConnectionPool(connect, max_size, timeout)
+    return _pool
+
+
+def _reset_after_fork():
+    """
+    Give a forked child (e.g. a gunicorn --preload worker) an empty pool.
+    SQLite connections must not be used across fork, and closing them could
+    checkpoint or unlock the parent's database, so they are only set aside.
+    """
+    global _pool
+    if _pool is not None:
+        _inherited_pools.append(_pool)
+        _pool = ConnectionPool(_pool.connect, _pool.max_size, _pool.timeout)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@contextmanager
+def get_conn():
+    """
+    Borrow a pooled connection.
+    Inside a request the connection is stored on flask.g and returned on teardown,
+    so every block in the same request shares it.
+    """
+    if has_app_context():
+        conn = g.get('_db_conn')
+        if conn is None:
+            try:
+                conn = g._db_conn = _pool.acquire()
+            except PoolTimeout:
+                # Remembered so the response can be turned into a 503 whatever the view did with the error
+                g._db_pool_timeout = True
+                raise
+        yield conn
+        return
+
+    conn = _pool.acquire()
+    try:
+        yield conn
+    finally:
+        _pool.release(conn)
+
+
+def release_conn(exc=None):
+    """Teardown hook: give the request's connection back to the pool"""
+    conn = g.pop('_db_conn', None)
+    if conn is not None:
+        _pool.release(conn)
+
+
+def pool_timeout_response(response):
+    """After-request hook: answer 503 when the request could not get a connection"""
+    if g.pop('_db_pool_timeout', False):
+        # Rewrite the view's response in place so headers added by other hooks (e.g. CORS) survive
+        response.set_data(json.dumps({'error': "Database is busy, please try again"}))
+        response.mimetype = 'application/json'
+        response.status_code = 503
+    return response
+
+
+def init_app(app, connect, max_size=10, timeout=None):
+    """Create the pool and register the request hooks on the Flask app"""
+    init_pool(connect, max_size, timeout)
+    app.after_request(pool_timeout_response)
+    app.teardown_appcontext(release_conn)
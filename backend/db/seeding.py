@@ -0,0 +1,44 @@
+"""
+Shared SQLite helpers for the seed scripts
+Connection settings and the secondary indexes that are dropped while
+bulk-loading and rebuilt once the data is in
+"""
+
+# Per-connection SQLite settings used while seeding
+SEED_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-65536',     # 64 MB page cache
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',   # 256 MB memory-mapped I/O
+    # Lets DELETE FROM sales / stock_logs use SQLite's truncate fast path. products never
+    # gets it: its FTS sync triggers must see every deleted row
+    'PRAGMA foreign_keys=OFF',
+)
+
+# Secondary indexes dropped while seeding and rebuilt once the data is in
+# (app.init_db creates the same ones through create_indexes)
+SEED_INDEXES = (
+    ('idx_products_sku', 'products(sku)'),
+    ('idx_products_category', 'products(category_id)'),
+    ('idx_sales_date', 'sales(sale_date)'),
+    ('idx_stock_logs_timestamp', 'stock_logs(timestamp)'),
+)
+
+
+def drop_indexes(cursor):
+    """Drop the secondary indexes so bulk inserts only append to the tables"""
+    for name, _ in SEED_INDEXES:
+        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def create_indexes(cursor):
+    """Create the secondary indexes if they are missing"""
+    for name, columns in SEED_INDEXES:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {columns}')
+
+
+def configure_conn(conn):
+    """Switch the database to WAL and apply the per-connection seeding settings"""
+    conn.execute('PRAGMA journal_mode=WAL')
+    for pragma in SEED_PRAGMAS:
+        conn.execute(pragma)
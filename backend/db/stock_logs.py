@@ -0,0 +1,144 @@
+"""
+Write-behind buffer for stock log entries
+Requests enqueue audit rows and a daemon thread batches them into stock_logs
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from db.bulk import bulk_insert
+
+StockLogEntry = namedtuple('StockLogEntry', ['product_id', 'change_amount', 'reason', 'timestamp'])
+
+SQL_INSERT_LOGS = '''
+    INSERT INTO stock_logs (product_id, change_amount, reason, timestamp)
+    VALUES (?, ?, ?, ?)
+'''
+
+# Entries held for retry while the database is busy; the oldest are dropped beyond this
+MAX_UNWRITTEN = 10000
+
+stock_log_queue = queue.Queue()
+
+_connect = None
+_conn = None
+_inherited_conns = []  # connections copied from the parent process by fork; kept alive, never used
+_interval = None
+_flush_lock = threading.Lock()
+_unwritten = []  # entries from a failed flush, retried first on the next one
+_writer = None
+
+
+def log_stock_change(product_id, change_amount, reason):
+    """Queue a stock log entry stamped with the current time in unix seconds"""
+    timestamp = int(time.time())
+    stock_log_queue.put(StockLogEntry(product_id, change_amount, reason, timestamp))
+
+
+def flush_logs():
+    """
+    Write every queued entry in one transaction; returns the number of rows written.
+    Transient failures (database busy/locked) keep the entries for the next flush.
+    If the batch violates a constraint it is retried entry by entry and the
+    rejected entries are dropped, so one bad row cannot block later logs.
+    """
+    global _conn
+    with _flush_lock:
+        batch = _take_batch()
+        if not batch:
+            return 0
+        
+        pending = batch
+        written = 0
+        try:
+            if _conn is None:
+                _conn = _connect()
+            try:
+                return bulk_insert(_conn, SQL_INSERT_LOGS, batch, chunk=len(batch))
+            except sqlite3.IntegrityError as e:
+                print(f"⚠️ Stock log batch rejected ({e}), retrying entries one by one")
+            
+            for i, entry in enumerate(batch):
+                pending = batch[i:]
+                try:
+                    written += bulk_insert(_conn, SQL_INSERT_LOGS, [entry])
+                except sqlite3.IntegrityError as e:
+                    print(f"❌ Dropping stock log entry {tuple(entry)}: {e}")
+            return written
+        except sqlite3.OperationalError as e:
+            print(f"❌ Failed to write {len(pending)} stock log entries, will retry: {e}")
+            _rollback()
+            _keep_unwritten(pending)
+            return written
+        except sqlite3.Error as e:
+            print(f"❌ Dropping {len(pending)} stock log entries: {e}")
+            _rollback()
+            return written
+
+
+def _take_batch():
+    """Collect the entries kept from a failed flush followed by everything queued since"""
+    global _unwritten
+    batch, _unwritten = _unwritten, []
+    while True:
+        try:
+            batch.append(stock_log_queue.get_nowait())
+        except queue.Empty:
+            return batch
+
+
+def _keep_unwritten(entries):
+    """Hold entries for the next flush, capped at MAX_UNWRITTEN"""
+    global _unwritten
+    if len(entries) > MAX_UNWRITTEN:
+        print(f"❌ Stock log retry backlog full, dropping {len(entries) - MAX_UNWRITTEN} oldest entries")
+        entries = entries[-MAX_UNWRITTEN:]
+    _unwritten = entries
+
+
+def _rollback():
+    if _conn is not None and _conn.in_transaction:
+        _conn.rollback()
+
+
+def _run(interval):
+    while True:
+        time.sleep(interval)
+        flush_logs()
+
+
+def start_writer(connect, interval=0.2):
+    """Start the background flush thread (once per process) and flush on shutdown"""
+    global _connect, _interval, _writer
+    _connect = connect
+    _interval = interval
+    if _writer is None:
+        _writer = threading.Thread(target=_run, args=(interval,), name='stock-log-writer', daemon=True)
+        _writer.start()
+        atexit.register(flush_logs)
+
+
+def _restart_after_fork():
+    """
+    Threads do not survive fork, so a forked child (e.g. a gunicorn --preload worker)
+    gets a fresh queue, lock and connection and its own writer thread.
+    The parent's connection is set aside rather than closed or reused.
+    """
+    global stock_log_queue, _conn, _flush_lock, _unwritten, _writer
+    if _conn is not None:
+        _inherited_conns.append(_conn)
+    stock_log_queue = queue.Queue()
+    _conn = None
+    _flush_lock = threading.Lock()
+    _unwritten = []
+    if _writer is not None:
+        _writer = threading.Thread(target=_run, args=(_interval,), name='stock-log-writer', daemon=True)
+        _writer.start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -6,7 +6,8 @@ Populates the database with sample data for testing and development
 import sqlite3
 import random
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
+from db.seeding import configure_conn, create_indexes, drop_indexes
 
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(__file__), 'inventory.db')
@@ -17,10 +18,17 @@ def seed():
     conn = None
     
     try:
-        conn = sqlite3.connect(DB_PATH)
+        # Manage the transaction explicitly so the whole seed is committed with one fsync
+        conn = sqlite3.connect(DB_PATH, isolation_level=None)
+        configure_conn(conn)
         cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        drop_indexes(cursor)
 
         print("🔄 Starting database seeding...")
+        
+        # One generator instance for every random value in the seed
+        rng = random.Random()
 
         # 1. Clear existing data (Careful! This resets the DB)
         print("  Clearing existing data...")
@@ -29,7 +37,6 @@ def seed():
         cursor.execute("DELETE FROM products")
         cursor.execute("DELETE FROM categories")
         cursor.execute("DELETE FROM sqlite_sequence WHERE name IN ('categories', 'products', 'sales', 'stock_logs')")
-        conn.commit()
 
         # 2. Add Categories
         print("  Adding categories...")
@@ -44,7 +51,6 @@ def seed():
             ('Health & Beauty',)
         ]
         cursor.executemany("INSERT INTO categories (name) VALUES (?)", categories)
-        conn.commit()
         print(f"  ✅ Added {len(categories)} categories")
 
         # 3. Add 50 Products with realistic names
@@ -80,59 +86,53 @@ def seed():
         category_ids = list(range(1, 9))  # 8 categories
         
         for i, name in enumerate(product_names[:50], 1):
-            cat_id = random.choice(category_ids)
-            sku = f"SKU-{random.randint(1000, 9999)}-{i:03d}"
-            price = round(random.uniform(10.0, 500.0), 2)
-            stock = random.randint(0, 100)
-            min_stock = random.randint(5, 20)
+            cat_id = rng.choice(category_ids)
+            sku = "SKU-%04d-%03d" % (rng.randint(1000, 9999), i)
+            price = round(rng.uniform(10.0, 500.0), 2)
+            stock = rng.randint(0, 100)
+            min_stock = rng.randint(5, 20)
             products.append((name, sku, cat_id, price, stock, min_stock))
 
         cursor.executemany(
             "INSERT INTO products (name, sku, category_id, price, stock_quantity, min_stock_level) VALUES (?, ?, ?, ?, ?, ?)",
             products
         )
-        conn.commit()
         print(f"  ✅ Added {len(products)} products")
 
         # 4. Add Sales for the last 7 days (for the Chart)
         print("  Adding sales data...")
-        sales = []
         product_ids = list(range(1, 51))  # 50 products
         
-        for day_offset in range(7):
-            date = datetime.now() - timedelta(days=day_offset)
-            # Create 5-15 sales per day
-            num_sales = random.randint(5, 15)
-            
-            for _ in range(num_sales):
-                p_id = random.choice(product_ids)
-                qty = random.randint(1, 5)
-                # Get product price for realistic total
-                cursor.execute("SELECT price FROM products WHERE id = ?", (p_id,))
-                price_result = cursor.fetchone()
-                if price_result:
-                    unit_price = float(price_result[0])
-                    total_price = round(unit_price * qty, 2)
-                    # Set specific time for the sale
-                    sale_datetime = date.replace(
-                        hour=random.randint(9, 18),
-                        minute=random.randint(0, 59),
-                        second=random.randint(0, 59)
-                    )
-                    sales.append((p_id, qty, total_price, sale_datetime.isoformat()))
-
-        cursor.executemany(
-            "INSERT INTO sales (product_id, quantity, total_price, sale_date) VALUES (?, ?, ?, ?)",
-            sales
-        )
-        conn.commit()
-        print(f"  ✅ Added {len(sales)} sales records")
+        # Sale times are unix seconds offset from today's local midnight
+        now = datetime.now()
+        today = int(now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+        
+        # About 5-15 sales per day, generated inside SQLite: each row picks a random
+        # product, quantity (1-5), day and time between 09:00:00 and 18:59:59
+        total_sales = sum(rng.randint(5, 15) for _ in range(7))
+        cursor.execute('''
+            INSERT INTO sales (product_id, quantity, total_price, sale_date)
+            WITH RECURSIVE seq(n) AS (
+                SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < :total_sales
+            ),
+            picks AS MATERIALIZED (
+                SELECT abs(random()) % :product_count + 1 AS product_id,
+                       abs(random()) % 5 + 1 AS qty,
+                       :today - (abs(random()) % 7) * 86400 + 32400 + abs(random()) % 36000 AS sale_ts
+                FROM seq
+            )
+            SELECT p.id, picks.qty, ROUND(p.price * picks.qty, 2), picks.sale_ts
+            FROM picks
+            JOIN products p ON p.id = picks.product_id
+        ''', {'total_sales': total_sales, 'product_count': len(product_ids), 'today': today})
+        sales_count = cursor.rowcount
+        print(f"  ✅ Added {sales_count} sales records")
 
         # 5. Add some stock logs for history
         print("  Adding stock logs...")
         stock_logs = []
-        for product_id in random.sample(product_ids, 20):  # Random 20 products
-            change_amount = random.randint(10, 50)
+        for product_id in rng.sample(product_ids, 20):  # Random 20 products
+            change_amount = rng.randint(10, 50)
             reasons = [
                 'Initial stock',
                 'Restock from supplier',
@@ -140,8 +140,8 @@ def seed():
                 'Inventory adjustment',
                 'Bulk purchase'
             ]
-            reason = random.choice(reasons)
-            timestamp = (datetime.now() - timedelta(days=random.randint(1, 30))).isoformat()
+            reason = rng.choice(reasons)
+            timestamp = int(now.timestamp()) - rng.randint(1, 30) * 86400
             stock_logs.append((product_id, change_amount, reason, timestamp))
 
         cursor.executemany(
@@ -151,10 +151,16 @@ def seed():
         conn.commit()
         print(f"  ✅ Added {len(stock_logs)} stock log entries")
 
+        # 6. Rebuild the indexes in their own transaction
+        cursor.execute("BEGIN IMMEDIATE")
+        create_indexes(cursor)
+        conn.commit()
+        print("  ✅ Indexes rebuilt")
+
         print("\n✅ Database seeded successfully!")
         print(f"   - {len(categories)} categories")
         print(f"   - {len(products)} products")
-        print(f"   - {len(sales)} sales records")
+        print(f"   - {sales_count} sales records")
         print(f"   - {len(stock_logs)} stock log entries")
         
     except sqlite3.Error as e:
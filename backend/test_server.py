@@ -4,13 +4,15 @@ Quick test script to verify the server setup
 
 import sys
 import os
+import sqlite3
+import tempfile
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
 try:
     print("Testing imports...")
-    from app import app, init_db, get_db_connection
+    from app import app, init_db, get_conn
     print("✅ All imports successful")
     
     print("\nTesting database initialization...")
@@ -18,12 +20,29 @@ try:
     print("✅ Database initialized")
     
     print("\nTesting database connection...")
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM products")
-    product_count = cursor.fetchone()[0]
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM products")
+        product_count = cursor.fetchone()[0]
     print(f"✅ Database connected - Found {product_count} products")
-    conn.close()
+    
+    print("\nTesting deterministic seeding (IMS_SEED=1)...")
+    import seed_real_products
+    os.environ['IMS_SEED'] = '1'
+    snapshots = []
+    for _ in range(2):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            seed_real_products.DB_PATH = os.path.join(tmp_dir, 'inventory.db')
+            seed_real_products.seed_real_products()
+            seed_conn = sqlite3.connect(seed_real_products.DB_PATH)
+            snapshots.append(seed_conn.execute(
+                'SELECT name, sku, price, purchasing_price, stock_quantity, min_stock_level FROM products ORDER BY id'
+            ).fetchall())
+            seed_conn.close()
+    os.environ.pop('IMS_SEED')
+    assert len(snapshots[0]) == 121, f"expected 121 seeded products, got {len(snapshots[0])}"
+    assert snapshots[0] == snapshots[1], "seeding with the same IMS_SEED produced different products"
+    print("✅ Seeding is reproducible - 121 identical products")
     
     print("\n✅ All tests passed! Server is ready to run.")
     print("\nTo start the server, run: python app.py")
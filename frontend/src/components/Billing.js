@@ -101,14 +101,13 @@ const Billing = ({ showToast }) => {
 
     try {
       setProcessing(true);
-      const promises = billItems.map(item =>
-        axios.post(`${API_BASE}/add-sale`, {
+      // One request for the whole bill: either every item is sold or none is
+      await axios.post(`${API_BASE}/add-sales`, {
+        items: billItems.map(item => ({
           product_id: item.id,
           quantity: item.quantity,
-        })
-      );
-
-      await Promise.all(promises);
+        })),
+      });
 
       showToast('Bill generated successfully', 'success');
 
@@ -118,7 +117,17 @@ const Billing = ({ showToast }) => {
       generateBillNumber();
     } catch (error) {
       console.error('Error generating bill:', error);
-      showToast('Failed to generate bill', 'error');
+      const itemErrors = error.response?.data?.items;
+      if (itemErrors?.length) {
+        // Only one toast is shown at a time, so list every rejected item in it
+        const messages = itemErrors.map(({ product_id, error: message }) => {
+          const item = billItems.find(billItem => billItem.id === product_id);
+          return `${item ? item.name : `Product ${product_id}`}: ${message}`;
+        });
+        showToast(messages.join('; '), 'error');
+      } else {
+        showToast(error.response?.data?.error || 'Failed to generate bill', 'error');
+      }
     } finally {
       setProcessing(false);
     }
@@ -5,6 +5,10 @@ import axios from 'axios';
 
 const API_BASE = 'http://localhost:5000/api';
 
+// Poll a queued PDF report every 500ms for at most a minute
+const PDF_POLL_INTERVAL_MS = 500;
+const PDF_MAX_POLLS = 120;
+
 const Dashboard = ({ showToast }) => {
   const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -28,9 +32,20 @@ const Dashboard = ({ showToast }) => {
 
   const handleExportPDF = async () => {
     try {
-      const response = await axios.get(`${API_BASE}/export-pdf`, {
+      // The report is rendered in the background; poll the job until the PDF is ready
+      const { data: job } = await axios.get(`${API_BASE}/export-pdf`);
+      let response = await axios.get(`${API_BASE}/export-pdf/${job.job_id}`, {
         responseType: 'blob',
       });
+      for (let polls = 0; response.status === 202; polls++) {
+        if (polls >= PDF_MAX_POLLS) {
+          throw new Error('Timed out waiting for the PDF report');
+        }
+        await new Promise((resolve) => setTimeout(resolve, PDF_POLL_INTERVAL_MS));
+        response = await axios.get(`${API_BASE}/export-pdf/${job.job_id}`, {
+          responseType: 'blob',
+        });
+      }
       const url = window.URL.createObjectURL(new Blob([response.data]));
       const link = document.createElement('a');
       link.href = url;